@@ -1,9 +1,12 @@
 import os
 import json
 import base64
+import orjson
 import numpy as np
+import pandas as pd
+import pyarrow as pa
 import geopandas as gpd
-from typing import Optional
+from typing import Optional, Tuple
 from pyiceberg.expressions import And, GreaterThanOrEqual, LessThanOrEqual
 from pyiceberg.catalog import load_catalog
 
@@ -40,11 +43,24 @@ def read_token(token_path: str) -> str:
     raise ValueError("Token JSON must be either a string or an object with a key 'token'.")
 
 
+def _orjson_default(x):
+    """Fallback for values orjson cannot serialize natively."""
+    if isinstance(x, np.ndarray):
+        return x.tolist()
+    if isinstance(x, set):
+        return list(x)
+    if isinstance(x, (bytes, bytearray)):
+        return base64.b64encode(x).decode("ascii")
+    return str(x)
+
+
 def json_str_tr(x):
     """
     Convert non-JSON-serializable Python objects (e.g., lists, dicts, arrays)
     into string representations that can be safely exported or visualized.
 
+    Containers are serialized with orjson, so the result is valid JSON.
+
     Parameters
     ----------
     x : Any
@@ -59,16 +75,29 @@ def json_str_tr(x):
         return None
     elif isinstance(x, (str, int, float, bool)):
         return str(x)
-    elif isinstance(x, (list, tuple, set, np.ndarray)):
-        return str(list(x))
-    elif isinstance(x, dict):
-        return str({k: json_str_tr(v) for k, v in x.items()})
+    elif isinstance(x, (list, tuple, set, dict, np.ndarray)):
+        return orjson.dumps(x, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
     elif isinstance(x, (bytes, bytearray)):
         return base64.b64encode(x).decode("ascii")
     else:
         return str(x)
 
 
+def _needs_json(pa_type) -> bool:
+    """Arrow types that do not map to a flat pandas value: nested (list / struct / map) and binary."""
+    return pa.types.is_nested(pa_type) or pa.types.is_binary(pa_type) or pa.types.is_large_binary(pa_type)
+
+
+def _clean_batch(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """Replace nested / binary columns of one record batch with JSON strings (see json_str_tr)."""
+    columns = [
+        # to_pylist keeps native Python values for json_str_tr
+        pa.array([json_str_tr(v) for v in col.to_pylist()], type=pa.string()) if _needs_json(col.type) else col
+        for col in batch.columns
+    ]
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names)
+
+
 def query_foursquare(
     token_path: str,
     minLon: float,
@@ -76,6 +105,7 @@ def query_foursquare(
     minLat: float,
     maxLat: float,
     limit_size: Optional[int] = None,
+    selected_fields: Tuple[str, ...] = ("*",),
     table_name: str = "datasets.places_os",
     uri: str = "https://catalog.h3-hub.foursquare.com/iceberg",
     warehouse: str = "places",
@@ -99,6 +129,8 @@ def query_foursquare(
         Geographic bounding box coordinates (in WGS84) for the query.
     limit_size : int, optional
         Maximum number of rows to return. If None (default), returns all available rows.
+    selected_fields : tuple of str, default ("*",)
+        Columns to read. Defaults to all; "latitude" and "longitude" must be included.
     table_name : str, default "datasets.places_os"
         Name of the Iceberg table to query.
     uri : str, default "https://catalog.h3-hub.foursquare.com/iceberg"
@@ -153,7 +185,18 @@ def query_foursquare(
     )
 
     # --- Run query ---
-    df = table.scan(row_filter=expr, limit=limit_size).to_pandas()
+    # read record batches (only the selected columns) and clean non-serializable
+    # columns batch by batch, so the nested values are never held for the whole result
+    reader = table.scan(
+        row_filter=expr, selected_fields=selected_fields, limit=limit_size
+    ).to_arrow_batch_reader()
+    schema = pa.schema([
+        pa.field(f.name, pa.string()) if _needs_json(f.type) else f for f in reader.schema
+    ])
+    arrow_tbl = pa.Table.from_batches((_clean_batch(b) for b in reader), schema=schema)
+    # Arrow-backed columns: no numpy/object copy, Arrow buffers freed as columns convert
+    df = arrow_tbl.to_pandas(self_destruct=True, types_mapper=pd.ArrowDtype)
+    del arrow_tbl
 
     # --- Convert to GeoDataFrame ---
     gdf = gpd.GeoDataFrame(
@@ -162,10 +205,4 @@ def query_foursquare(
         crs="EPSG:4326",
     )
 
-    # --- Clean up non-serializable columns ---
-    for col in gdf.columns:
-        if col != "geometry":
-            if gdf[col].apply(lambda x: isinstance(x, (list, dict, np.ndarray, bytes, bytearray))).any():
-                gdf[col] = gdf[col].apply(json_str_tr)
-
     return gdf
\ No newline at end of file
@@ -1,14 +1,18 @@
 import math
 import time
+import threading
 import requests
 import json
 import warnings
 from typing import Optional, Iterable, List, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 import geopandas as gpd
-from shapely.geometry import box, Point
+import shapely
+from shapely.geometry import box
+from pyproj import Transformer
 import matplotlib.pyplot as plt
 from matplotlib.patches import Patch
 
@@ -120,26 +124,39 @@ def circle_center(
         centers_xy = np.column_stack([xx.ravel(), yy.ravel()])
 
     # -----------------------------
-    # 4) Build circles in 3857 -> back to 4326
+    # 4) Coarse bbox prefilter: drop centers whose circle cannot reach base
     # -----------------------------
     radius_m = R
-    circles_3857 = [Point(cx, cy).buffer(radius_m, resolution=64) for (cx, cy) in centers_xy]
-    circles = gpd.GeoDataFrame(geometry=circles_3857, crs="EPSG:3857").to_crs(epsg=4326)
+    bminx, bminy, bmaxx, bmaxy = base.to_crs(epsg=3857).total_bounds
+    keep = (
+        (centers_xy[:, 0] >= bminx - radius_m) & (centers_xy[:, 0] <= bmaxx + radius_m)
+        & (centers_xy[:, 1] >= bminy - radius_m) & (centers_xy[:, 1] <= bmaxy + radius_m)
+    )
+    centers_xy = centers_xy[keep]
+
+    # -----------------------------
+    # 5) Build circles in 3857 -> back to 4326
+    #    (centers reprojected directly, no centroid round-trip later)
+    # -----------------------------
+    to_4326 = Transformer.from_crs(3857, 4326, always_xy=True)
+    center_lon, center_lat = to_4326.transform(centers_xy[:, 0], centers_xy[:, 1])
+    # 16 segments per quarter circle is plenty for an intersects test
+    circles_3857 = shapely.buffer(shapely.points(centers_xy), radius_m, quad_segs=16)
+    circles = gpd.GeoDataFrame(
+        {"center_lon": center_lon, "center_lat": center_lat},
+        geometry=circles_3857,
+        crs="EPSG:3857",
+    ).to_crs(epsg=4326)
 
     # -----------------------------
-    # 5) Optional: filter circles by intersection with base
+    # 6) Optional: filter circles by intersection with base
     # -----------------------------
     base_4326 = base.to_crs("EPSG:4326")
     circles_4326 = (
         gpd.sjoin(circles, base_4326, how="inner", predicate="intersects")
             .reset_index(drop=True)
     )
-    circles_4326 = circles_4326[circles.columns]
-    circles_m = circles_4326.to_crs(epsg=3857)
-    centroids_m = circles_m.geometry.centroid
-    centroids_ll = centroids_m.to_crs(epsg=4326)
-    circles_4326["center_lon"] = centroids_ll.x
-    circles_4326["center_lat"] = centroids_ll.y
+    circles_4326 = circles_4326[["geometry", "center_lon", "center_lat"]]
     
     return circles_4326
 
@@ -152,6 +169,7 @@ def places_nearby_grid(
     field_mask: Iterable[str],
     max_result_count: int = 20,
     sleep_sec: float = 0.1,
+    max_workers: int = 16,
 ) -> gpd.GeoDataFrame:
     """
     Query Google Places Nearby Search for each circle center.
@@ -171,7 +189,10 @@ def places_nearby_grid(
     max_result_count : int, default 20
         Max results per query (Google cap).
     sleep_sec : float, default 0.1
-        Sleep time between requests to avoid rate limiting.
+        Minimum spacing between request starts (across all threads)
+        to avoid rate limiting.
+    max_workers : int, default 16
+        Number of requests in flight at once (thread pool size).
 
     Returns
     -------
@@ -187,11 +208,20 @@ def places_nearby_grid(
         "X-Goog-FieldMask": ",".join(field_mask),
     }
 
-    rows: List[Dict[str, Any]] = []
+    # requests are network-bound -> run them concurrently, rate-limited to one start per sleep_sec
+    lock = threading.Lock()
+    next_start = [time.monotonic()]
+
+    def _throttle():
+        with lock:
+            now = time.monotonic()
+            wait = next_start[0] - now
+            next_start[0] = max(now, next_start[0]) + sleep_sec
+        if wait > 0:
+            time.sleep(wait)
 
-    for circle_id, row in circles.iterrows():
-        lat = row["center_lat"]
-        lon = row["center_lon"]
+    def _fetch(job):
+        circle_id, lat, lon = job
 
         payload = {
             "locationRestriction": {
@@ -207,24 +237,28 @@ def places_nearby_grid(
             "maxResultCount": int(max_result_count),
         }
 
+        _throttle()
         resp = requests.post(url, headers=headers, json=payload, timeout=30)
-        data = resp.json()
-
-        places = data.get("places", [])
-
-        for p in places:
-            rows.append({
-                "circle_id": circle_id,
-                "id": p.get("id"),
-                "name": p.get("displayName", {}).get("text"),
-                "address": p.get("formattedAddress"),
-                "primary_type": p.get("primaryType"),
-                "lat": p.get("location", {}).get("latitude"),
-                "lon": p.get("location", {}).get("longitude"),
-                "business_status": p.get("businessStatus"),
-            })
-
-        time.sleep(sleep_sec)
+        return circle_id, resp.json()
+
+    jobs = zip(circles.index, circles["center_lat"], circles["center_lon"])
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_fetch, jobs))
+
+    rows: List[Dict[str, Any]] = [
+        {
+            "circle_id": circle_id,
+            "id": p.get("id"),
+            "name": p.get("displayName", {}).get("text"),
+            "address": p.get("formattedAddress"),
+            "primary_type": p.get("primaryType"),
+            "lat": p.get("location", {}).get("latitude"),
+            "lon": p.get("location", {}).get("longitude"),
+            "business_status": p.get("businessStatus"),
+        }
+        for circle_id, data in results
+        for p in data.get("places", [])
+    ]
 
     df = pd.DataFrame(rows)
     gdf = gpd.GeoDataFrame(
@@ -1,4 +1,10 @@
+import re
+from functools import reduce
+import numpy as np
 import pandas as pd
+import geopandas as gpd
+import shapely
+from pyproj import Transformer
 from pyrosm import OSM
 
 def extract_comprehensive_pois(pbf):
@@ -19,10 +25,20 @@ def extract_comprehensive_pois(pbf):
     pois = osm.get_pois(custom_filter=custom_filter)
     if pois is None: return None
 
-    # Convert Polygons to Points and defragment DataFrame to fix PerformanceWarnings
-    pois = pois.to_crs(3857)
-    pois['geometry'] = pois.geometry.centroid
-    pois = pois.to_crs(4326)
+    # Convert Polygons to Points (centroid in 3857); Point rows are already points -> left untouched
+    geoms = pois.geometry.to_numpy()
+    is_poly = shapely.get_type_id(geoms) > 0
+    if is_poly.any():
+        to_3857 = Transformer.from_crs(4326, 3857, always_xy=True)
+        to_4326 = Transformer.from_crs(3857, 4326, always_xy=True)
+        polys = shapely.transform(geoms[is_poly], lambda xy: np.column_stack(to_3857.transform(xy[:, 0], xy[:, 1])))
+        cen = shapely.centroid(polys)
+        lon, lat = to_4326.transform(shapely.get_x(cen), shapely.get_y(cen))
+        geoms = geoms.copy()
+        geoms[is_poly] = shapely.points(lon, lat)
+    pois['geometry'] = gpd.GeoSeries(geoms, index=pois.index, crs=4326)
+    # defragment DataFrame before the 'cat' / 'address' inserts to fix PerformanceWarnings
+    # (copy, not reset_index: under copy-on-write reset_index keeps the fragmented blocks)
     pois = pois.copy()
 
     # Unified Category Logic
@@ -31,27 +47,23 @@ def extract_comprehensive_pois(pbf):
         'religion', 'emergency', 'historic', 'government', 'craft', 'public_transport'
     ]
     existing_cats = [c for c in cat_columns if c in pois.columns]
-    pois['cat'] = pois[existing_cats].bfill(axis=1).iloc[:, 0]
+    # first non-null category column per row; column-wise fillna chain, no row-wise bfill frame
+    pois['cat'] = reduce(lambda a, b: a.fillna(b), (pois[c] for c in existing_cats))
     
-    # Address Reconstruction Function
-    def build_address(row):
-        num = str(row.get('addr:housenumber', '')).strip()
-        street = str(row.get('addr:street', '')).strip()
-        num = '' if num.lower() in ['nan', 'none'] else num
-        street = '' if street.lower() in ['nan', 'none'] else street
-        
-        if num and street:
-            return f"{num} {street}"
-        elif street: 
-            return street
-        
-        # Fallback to building name
-        housename = str(row.get('addr:housename', '')).strip()
-        if housename and housename.lower() not in ['nan', 'none']:
-            return housename
-        return "N/A"
-
-    pois['address'] = pois.apply(build_address, axis=1)
+    # Address Reconstruction (vectorized string ops instead of a row-wise apply)
+    def addr_part(col):
+        if col not in pois.columns:
+            return pd.Series(pd.NA, index=pois.index, dtype="string")
+        s = pois[col].astype("string").str.strip()
+        return s.mask(s.str.lower().isin(["nan", "none", ""]))
+
+    num = addr_part('addr:housenumber')
+    street = addr_part('addr:street')
+    housename = addr_part('addr:housename')
+
+    # "num street" -> street -> building name fallback -> "N/A"
+    address = (num + " " + street).fillna(street)
+    pois['address'] = address.fillna(housename).fillna("N/A").astype(object)
     
     # Filter final schema
     output_cols = ['id','timestamp','name', 'cat', 'address', 'tags', 'visible', 'version', 'geometry']
@@ -72,55 +84,56 @@ gdf_posa = extract_comprehensive_pois("/Users/houpuli/Downloads/washington-26022
 # msa_ny_osm['timestamp'] = msa_ny_osm['timestamp'].astype(str)
 # msa_ny_osm = msa_ny_osm.drop_duplicates(subset=['id'], keep='first').reset_index(drop=True)
 
-msa_posa_osm = gpd.sjoin(gdf_posa, msa_bspo, how='inner', predicate='within').reset_index(drop=True)
+msa_posa_osm = gpd.sjoin(gdf_posa, msa_bspo, how='inner', predicate='within')
 msa_posa_osm = msa_posa_osm.drop(columns=['index_right','OBJECTID','CBSACODE','CBSANAME','CBSATYPE','ALAND','AWATER'])
 msa_posa_osm['id'] = msa_posa_osm['id'].astype(str)
 msa_posa_osm['timestamp'] = msa_posa_osm['timestamp'].astype(str)
-msa_posa_osm = msa_posa_osm.drop_duplicates(subset=['id'], keep='first').reset_index(drop=True)
-
-def normalize_nulls(df):
-    NULL_LIKE = ["none", "null", "nan", "n/a", "na", "", " ", "   "]
-    df = df.copy()
-
-    geom = None
-    if isinstance(df, gpd.GeoDataFrame):
-        geom = df.geometry
-        geom_name = df.geometry.name
+msa_posa_osm = msa_posa_osm.drop_duplicates(subset=['id'], keep='first')
+# one reset at the end of the chain, in place
+msa_posa_osm.reset_index(drop=True, inplace=True)
 
+# null-like strings (any case, surrounding whitespace): none / null / nan / n/a / na / blank
+_NULL_RE = re.compile(r"^\s*(none|null|nan|n/?a|)\s*$", re.IGNORECASE)
 
-    cols = df.columns if geom is None else df.columns.drop(geom_name)
-    df[cols] = df[cols].replace(r"^\s*$", pd.NA, regex=True)
-    df[cols] = df[cols].replace(
-        [x.upper() for x in NULL_LIKE] +
-        [x.lower() for x in NULL_LIKE] +
-        [x.capitalize() for x in NULL_LIKE],
-        pd.NA
-    )
-
-    df[cols] = df[cols].replace({None: pd.NA})
-    df[cols] = df[cols].where(pd.notna(df[cols]), pd.NA)
-
-    if geom is not None:
-        df = gpd.GeoDataFrame(df, geometry=geom, crs=geom.crs)
+def normalize_nulls(df):
+    # modifies df in place, column by column (no full-frame copy); returns it for chaining
+    geom_name = df.geometry.name if isinstance(df, gpd.GeoDataFrame) else None
+
+    # only object / string columns can hold strings -> one regex pass over each
+    for col in df.columns:
+        if col == geom_name:
+            continue
+        dtype = df[col].dtype
+        if dtype == object:
+            # regex never touches None / float NaN -> fillna turns those into pd.NA too
+            df[col] = df[col].replace(_NULL_RE, pd.NA, regex=True).fillna(pd.NA)
+        elif isinstance(dtype, pd.StringDtype):
+            df[col] = df[col].replace(_NULL_RE, pd.NA, regex=True)
 
     return df
 
 msa_posa_osm = normalize_nulls(msa_posa_osm)
 
-import json
+import orjson
 
 def extract_from_tags(tag_str, priority_keys):
     # if not tag_str or tag_str == 'None':
     #     return None
-    if pd.isna(tag_str):
+    # pyrosm may already hand back a dict -> no JSON round-trip needed
+    if isinstance(tag_str, dict):
+        tags_dict = tag_str
+    elif isinstance(tag_str, str):
+        try:
+            tags_dict = orjson.loads(tag_str)
+        except orjson.JSONDecodeError:
+            return None
+    else:
         return None
-    try:
-        tags_dict = json.loads(tag_str)
-        for key in priority_keys:
-            if key in tags_dict:
-                return tags_dict[key]
-    except:
+    if not isinstance(tags_dict, dict):
         return None
+    for key in priority_keys:
+        if key in tags_dict:
+            return tags_dict[key]
     return None
 
 target_keys = [
@@ -130,5 +143,5 @@ target_keys = [
 ]
 
 mask = msa_posa_osm['cat'].isna()
-msa_posa_osm.loc[mask, 'cat'] = msa_posa_osm.loc[mask, 'tags'].apply(lambda x: extract_from_tags(x, target_keys))
+msa_posa_osm.loc[mask, 'cat'] = [extract_from_tags(x, target_keys) for x in msa_posa_osm.loc[mask, 'tags'].to_numpy()]
 # msa_posa_osm.to_file('/Users/houpuli/Redlining Lab Dropbox/HOUPU LI/POI research/posa_osm.geojson')
\ No newline at end of file
@@ -1,20 +1,45 @@
+import numpy as np
 import pandas as pd
 import geopandas as gpd
-from rapidfuzz import fuzz
+from rapidfuzz import process, fuzz
 import re
+import sys
 import unicodedata
 
+# compiled once, clean_name runs on every POI name
+_RE_PAREN = re.compile(r"\([^)]*\)")
+_RE_SPACE = re.compile(r"\s+")
+# str.translate table deleting combining marks (accents left over after NFKD)
+_COMBINING = dict.fromkeys(c for c in range(sys.maxunicode + 1) if unicodedata.combining(chr(c)))
+
+
+class _AsciiWordTable(dict):
+    """str.translate table: keep ASCII word/space chars, other ASCII -> space, non-ASCII dropped."""
+
+    def __missing__(self, cp):
+        c = chr(cp)
+        if cp >= 128:
+            value = None
+        elif c.isalnum() or c == "_" or c.isspace():
+            value = cp
+        else:
+            value = " "
+        self[cp] = value
+        return value
+
+_ASCII_WORD = _AsciiWordTable()
+
+# not cached: addresses are mostly unique, a cache would only pin them in memory
 def clean_name(s):
     if not isinstance(s, str):
         return ""
 
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(c for c in s if not unicodedata.combining(c)) # 1. unicode normalize (remove accents)
+    if not s.isascii(): # ASCII is already NFKD with no accents -> skip (isascii is O(1))
+        s = unicodedata.normalize("NFKD", s).translate(_COMBINING) # 1. unicode normalize (remove accents)
     s = s.upper() # 2. uppercase
-    s = re.sub(r"\([^)]*\)", "", s) 
-    s = s.encode("ascii", errors="ignore").decode() # 4. remove emoji / non ascii
-    s = re.sub(r"[^\w\s]", " ", s) # 5. replace special chars with space
-    s = re.sub(r"\s+", " ", s) # 6. collapse spaces
+    s = _RE_PAREN.sub("", s) 
+    s = s.translate(_ASCII_WORD) # 4-5. remove emoji / non ascii, replace special chars with space
+    s = _RE_SPACE.sub(" ", s) # 6. collapse spaces
 
     return s.strip()
 
@@ -43,40 +68,45 @@ def address_score_check(
     id_to_addr_clean = compared_gdf.set_index(id_col)[addr_col_cmp].apply(clean_name).to_dict()
     id_to_addr_raw = compared_gdf.set_index(id_col)[addr_col_cmp].to_dict()
 
-    scores = []
-    matched_addrs = []
+    # plain object arrays instead of iterrows() -> no per-row Series
+    matched_id_arr = reference_gdf[matched_id_col].to_numpy(object)
+    addr_ref_arr = reference_gdf[addr_col_ref].to_numpy(object)
+    n = len(matched_id_arr)
+
+    scores = np.full(n, pd.NA, dtype=object)
+    matched_addrs = np.full(n, pd.NA, dtype=object)
 
-    for _, row in reference_gdf.iterrows():
-        matched_id = row.get(matched_id_col)
+    # aligned (ref, cmp) address arrays; "" where a side is missing
+    ref_addrs = np.full(n, "", dtype=object)
+    cmp_addrs = np.full(n, "", dtype=object)
+
+    for i in range(n):
+        matched_id = matched_id_arr[i]
 
         # no matched id -> no score
         if pd.isna(matched_id):
-            scores.append(pd.NA)
-            matched_addrs.append(pd.NA)
             continue
 
-        addr_ref = clean_name(row.get(addr_col_ref))
         addr_cmp = id_to_addr_clean.get(matched_id)
 
         if isinstance(addr_cmp, str) and addr_cmp.strip():
-            matched_addrs.append(id_to_addr_raw.get(matched_id))
-        else:
-            matched_addrs.append(pd.NA)
-
-        # missing address on either side -> no score
-        if not isinstance(addr_ref, str) or not addr_ref.strip():
-            scores.append(pd.NA)
-            continue
-        if not isinstance(addr_cmp, str) or not addr_cmp.strip():
-            scores.append(pd.NA)
-            continue
-
-        wr = fuzz.WRatio(addr_ref, addr_cmp)
-        pr = fuzz.partial_ratio(addr_ref, addr_cmp)
-        ts = fuzz.token_sort_ratio(addr_ref, addr_cmp)
-        tset = fuzz.token_set_ratio(addr_ref, addr_cmp)
-
-        scores.append(int(max(wr, pr, ts, tset)))
+            matched_addrs[i] = id_to_addr_raw.get(matched_id)
+            cmp_addrs[i] = addr_cmp
+
+        ref_addrs[i] = clean_name(addr_ref_arr[i])
+
+    # missing address on either side -> no score
+    valid = (ref_addrs != "") & (cmp_addrs != "")
+
+    if valid.any():
+        ref_v = ref_addrs[valid].tolist()
+        cmp_v = cmp_addrs[valid].tolist()
+        # pairwise scoring of aligned arrays in C, max over the four scorers
+        best = np.maximum.reduce([
+            process.cpdist(ref_v, cmp_v, scorer=scorer, workers=-1)
+            for scorer in (fuzz.WRatio, fuzz.partial_ratio, fuzz.token_sort_ratio, fuzz.token_set_ratio)
+        ])
+        scores[valid] = best.astype(int).tolist()
 
     result = reference_gdf.copy()
     result[out_col] = scores
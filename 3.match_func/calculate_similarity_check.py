@@ -1,20 +1,143 @@
+import os
+import fcntl
+import pickle
+import hashlib
+import warnings
 import pandas as pd
 import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
+_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+def _load_model(onnx: bool = False):
+    """
+    all-MiniLM-L6-v2 on MPS (fp16) if available, else plain PyTorch on CPU.
+
+    With `onnx=True` the CPU path uses the int8-quantized ONNX export instead
+    (needs optimum / onnxruntime; the AVX512-VNNI export is only accurate on
+    VNNI CPUs) and falls back to PyTorch if it cannot be loaded.
+    """
+    device = "mps" if torch.backends.mps.is_available() else "cpu"
+    if device == "mps":
+        # fp16 on MPS halves weight/activation bandwidth
+        return SentenceTransformer(
+            _MODEL_NAME,
+            device=device,
+            model_kwargs={"torch_dtype": "float16"},
+        )
+    if onnx:
+        try:
+            # int8-quantized ONNX Runtime backend is much faster than PyTorch on CPU
+            return SentenceTransformer(
+                _MODEL_NAME,
+                device=device,
+                backend="onnx",
+                model_kwargs={"file_name": "model_qint8_avx512_vnni.onnx"},
+            )
+        except Exception as e:
+            warnings.warn(f"ONNX backend unavailable ({e!r}); falling back to PyTorch on CPU.")
+    return SentenceTransformer(_MODEL_NAME, device=device)
+
+def _cache_tag(model):
+    """Cache file prefix naming what produced the vectors: model, backend, dtype, normalization."""
+    backend = getattr(model, "backend", "torch")
+    # the ONNX path only ever loads the int8 export
+    precision = str(next(model.parameters()).dtype).replace("torch.", "") if backend == "torch" else "qint8"
+    return f"{_MODEL_NAME}_{backend}_{precision}_normalized"
+
+def _encode(model, texts, cache_dir=None):
+    """
+    Encode `texts` to unit-length embeddings (a tensor on the model device).
+
+    With `cache_dir`, embeddings persist across runs: vectors are appended to a
+    float16 file read back via np.memmap, with a pickled {blake2b(text): row}
+    index alongside. Only texts missing from the index are encoded. Both file
+    names carry the model / backend / dtype (`_cache_tag`), so different
+    models sharing one cache_dir never mix. Writers hold an fcntl lock on a
+    sidecar `.lock` file (POSIX only).
+    """
+    if cache_dir is None:
+        return model.encode(
+            texts, batch_size=256, show_progress_bar=True, convert_to_tensor=True, normalize_embeddings=True
+        )
+
+    dim = model.get_sentence_embedding_dimension()
+    if len(texts) == 0:
+        return torch.empty((0, dim), dtype=torch.float32, device=model.device)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tag = _cache_tag(model)
+    vec_path = os.path.join(cache_dir, f"{tag}.f16")
+    idx_path = os.path.join(cache_dir, f"{tag}_index.pkl")
+    lock_path = os.path.join(cache_dir, f"{tag}.lock")
+
+    def _load_index():
+        if not os.path.exists(idx_path):
+            return {}
+        with open(idx_path, "rb") as f:
+            return pickle.load(f)
+
+    index = _load_index()
+
+    keys = [hashlib.blake2b(t.encode(), digest_size=16).digest() for t in texts]
+    # dict: duplicate texts are encoded once
+    misses = {k: t for k, t in zip(keys, texts) if k not in index}
+
+    if misses:
+        print(f"Embedding cache: {len(set(keys)) - len(misses)} hits, {len(misses)} misses")
+        emb_new = model.encode(
+            list(misses.values()), batch_size=256, show_progress_bar=True, convert_to_numpy=True, normalize_embeddings=True
+        )
+        row_bytes = 2 * dim
+        # exclusive lock around append + index update: concurrent sessions sharing
+        # cache_dir take turns, so row ids never point at another writer's rows
+        with open(lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            # index as it is on disk now; skip texts another session added meanwhile
+            index = _load_index()
+            new_rows = [i for i, k in enumerate(misses) if k not in index]
+            new_keys = [k for k in misses if k not in index]
+            with open(vec_path, "ab") as f:
+                # row ids come from the file itself, not len(index): an earlier run may have
+                # died between the two writes (drop any partial trailing row first)
+                start = f.seek(0, os.SEEK_END) // row_bytes
+                f.truncate(start * row_bytes)
+                emb_new[new_rows].astype(np.float16).tofile(f)
+            index.update((k, start + i) for i, k in enumerate(new_keys))
+            # write to a temp file and swap in: a reader never sees a half-written index
+            tmp_path = f"{idx_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(index, f)
+            os.replace(tmp_path, idx_path)
+
+    store = np.memmap(vec_path, dtype=np.float16, mode="r").reshape(-1, dim)
+    # fp16 on disk, fp32 for cosine
+    emb = store[[index[k] for k in keys]].astype(np.float32)
+    return torch.from_numpy(emb).to(model.device)
+
 def calculate_similarity_check(
     df, 
     cat_col_ref: str = "primary_type", 
     cat_col_cmp: str = "matched_cat_main", 
     id_col: str = "matched_id", 
     result_col: str =  "category_sim",
+    cache_dir: str = None,
+    onnx: bool = False,
 ):
+    """
+    Cosine similarity between `cat_col_ref` and `cat_col_cmp` embeddings
+    (all-MiniLM-L6-v2) for rows with a matched id; written to `result_col`.
 
-    # 1. Setup Device
-    device = "mps" if torch.backends.mps.is_available() else "cpu"
-    model = SentenceTransformer('all-MiniLM-L6-v2', device=device)
+    If `cache_dir` is given, category embeddings are cached on disk there and
+    reused by later runs; files are named per model/backend, so one cache_dir
+    can be shared.
+    `onnx=True` encodes with the quantized ONNX model on CPU (see `_load_model`).
+    """
+
+    # 1. Setup Device / model
+    model = _load_model(onnx)
     
     # 2. Primary Gatekeeper: matched_id must be present
     mask = df[id_col].notna() & (df[id_col].astype(str).str.strip() != "")
@@ -26,17 +149,30 @@ def calculate_similarity_check(
     text_missing_mask = temp_df[cat_col_ref].isna() | temp_df[cat_col_cmp].isna()
     
     # Fill NaNs with empty strings just for the encoding step
-    texts_1 = temp_df[cat_col_ref].fillna("").astype(str).tolist()
-    texts_2 = temp_df[cat_col_cmp].fillna("").astype(str).tolist()
+    texts = temp_df[[cat_col_ref, cat_col_cmp]].fillna("").astype(str)
 
-    print(f"Encoding {len(temp_df)} rows...")
+    # Distinct (ref, cmp) pairs are far fewer than rows -> score each pair once
+    pairs = texts.drop_duplicates().reset_index(drop=True)
+    texts_1 = pairs[cat_col_ref].tolist()
+    texts_2 = pairs[cat_col_cmp].tolist()
 
-    # 4. Batch Encoding
-    emb1 = model.encode(texts_1, batch_size=256, show_progress_bar=True, convert_to_tensor=True)
-    emb2 = model.encode(texts_2, batch_size=256, show_progress_bar=True, convert_to_tensor=True)
+    print(f"Encoding {len(pairs)} unique pairs for {len(temp_df)} rows...")
 
-    # 5. Calculate Similarity
-    scores = torch.nn.functional.cosine_similarity(emb1, emb2, dim=1).cpu().numpy()
+    # 4. Batch Encoding (categories repeat a lot -> encode uniques only, gather back by inverse index)
+    # model.encode already length-sorts inputs into batches (smart batching) and restores order,
+    # so no manual argsort is needed here
+    u1, inv1 = np.unique(texts_1, return_inverse=True)
+    u2, inv2 = np.unique(texts_2, return_inverse=True)
+    emb_u1 = _encode(model, list(u1), cache_dir)
+    emb_u2 = _encode(model, list(u2), cache_dir)
+    emb1 = emb_u1[torch.as_tensor(inv1, device=emb_u1.device)]
+    emb2 = emb_u2[torch.as_tensor(inv2, device=emb_u2.device)]
+
+    # 5. Calculate Similarity per pair, broadcast back to rows
+    # embeddings are unit length -> cosine is a plain dot product
+    # cast to fp32 so the dot-product accumulation does not lose precision
+    pairs[result_col] = (emb1.float() * emb2.float()).sum(dim=1).cpu().numpy()
+    scores = texts.merge(pairs, on=[cat_col_ref, cat_col_cmp], how="left")[result_col].to_numpy(copy=True)
     
     # 6. Apply NaN to rows where text was missing
     # Even if we encoded an empty string, the result isn't "real" if data was missing
@@ -46,4 +182,57 @@ def calculate_similarity_check(
     df[result_col] = np.nan
     df.loc[mask, result_col] = scores
     
-    return df
\ No newline at end of file
+    return df
+
+def similar_categories(
+    categories,
+    query_categories=None,
+    k: int = 5,
+    cache_dir: str = None,
+    onnx: bool = False,
+):
+    """
+    Top-k most similar categories (cosine on all-MiniLM-L6-v2 embeddings)
+    using a FAISS inner-product index over the unique `categories`.
+
+    Parameters
+    ----------
+    categories : iterable of str
+        Category corpus to search in (NaN / duplicates are dropped).
+    query_categories : iterable of str, optional
+        Categories to look up. Defaults to `categories` itself
+        (each category is then its own top hit).
+    k : int, default 5
+        Neighbours per query.
+    cache_dir : str, optional
+        Embedding cache directory, as in `calculate_similarity_check`.
+    onnx : bool, default False
+        Use the quantized ONNX model on CPU, as in `calculate_similarity_check`.
+
+    Returns
+    -------
+    DataFrame with columns: query, rank, neighbor, similarity
+    """
+    import faiss
+
+    corpus = sorted(pd.Series(categories).dropna().astype(str).unique())
+    queries = corpus if query_categories is None else sorted(pd.Series(query_categories).dropna().astype(str).unique())
+    k = min(k, len(corpus))
+
+    model = _load_model(onnx)
+    emb_c = _encode(model, corpus, cache_dir).float().cpu().numpy()
+    emb_q = _encode(model, queries, cache_dir).float().cpu().numpy()
+
+    # embeddings are unit length -> inner product == cosine
+    index = faiss.IndexFlatIP(emb_c.shape[1])
+    if faiss.get_num_gpus() > 0:
+        index = faiss.index_cpu_to_all_gpus(index)
+    index.add(emb_c)
+    sims, nbrs = index.search(emb_q, k)
+
+    return pd.DataFrame({
+        "query": np.repeat(queries, k),
+        "rank": np.tile(np.arange(1, k + 1), len(queries)),
+        "neighbor": np.asarray(corpus, dtype=object)[nbrs.ravel()],
+        "similarity": sims.ravel(),
+    })
@@ -1,22 +1,49 @@
 from rapidfuzz import process, fuzz
+from joblib import Parallel, delayed, effective_n_jobs
+import numpy as np
 import pandas as pd
 import re
+import sys
 import unicodedata
 
 
+# compiled once, clean_name runs on every POI name
+_RE_PAREN = re.compile(r"\([^)]*\)")
+_RE_APOS_S = re.compile(r"\b'S\b")
+_RE_S = re.compile(r"\bS\b")
+_RE_SPACE = re.compile(r"\s+")
+# str.translate table deleting combining marks (accents left over after NFKD)
+_COMBINING = dict.fromkeys(c for c in range(sys.maxunicode + 1) if unicodedata.combining(chr(c)))
+
+
+class _AsciiWordTable(dict):
+    """str.translate table: keep ASCII word/space chars, other ASCII -> space, non-ASCII dropped."""
+
+    def __missing__(self, cp):
+        c = chr(cp)
+        if cp >= 128:
+            value = None
+        elif c.isalnum() or c == "_" or c.isspace():
+            value = cp
+        else:
+            value = " "
+        self[cp] = value
+        return value
+
+_ASCII_WORD = _AsciiWordTable()
+
 def clean_name(s):
     if not isinstance(s, str):
         return ""
 
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(c for c in s if not unicodedata.combining(c)) # 1. unicode normalize (remove accents)
+    if not s.isascii(): # ASCII is already NFKD with no accents -> skip (isascii is O(1))
+        s = unicodedata.normalize("NFKD", s).translate(_COMBINING) # 1. unicode normalize (remove accents)
     s = s.upper() # 2. uppercase
-    s = re.sub(r"\([^)]*\)", "", s) 
-    s = re.sub(r"\b'S\b", "", s) # new change
-    s = re.sub(r"\bS\b", "", s) # new change
-    s = s.encode("ascii", errors="ignore").decode() # 4. remove emoji / non ascii
-    s = re.sub(r"[^\w\s]", " ", s) # 5. replace special chars with space
-    s = re.sub(r"\s+", " ", s) # 6. collapse spaces
+    s = _RE_PAREN.sub("", s) 
+    s = _RE_APOS_S.sub("", s) # new change
+    s = _RE_S.sub("", s) # new change
+    s = s.translate(_ASCII_WORD) # 4-5. remove emoji / non ascii, replace special chars with space
+    s = _RE_SPACE.sub(" ", s) # 6. collapse spaces
 
     return s.strip()
 
@@ -30,6 +57,75 @@ def extract_prinmary_str(name):
         return " ".join(core)
     return name
 
+# max reference rows per block, bounds the flat (query, candidate) pair lists
+_BLOCK_ROWS = 20000
+# combined name score = max(WRatio, these) over each row's WRatio top _TOP_K candidates
+# (WRatio alone scales partial x0.9 / x0.6 and token x0.95 scores down, so it is not a substitute)
+_EXTRA_SCORERS = (fuzz.partial_ratio, fuzz.token_sort_ratio, fuzz.token_set_ratio)
+_TOP_K = 5
+
+def _score_block(queries, cand_rows, id_to_idx, clean_arr, workers):
+    """
+    Best candidate for each row of a block by combined score
+    max(WRatio, partial_ratio, token_sort_ratio, token_set_ratio).
+
+    All (query, candidate name) pairs of the block are flattened and scored
+    with WRatio in one rapidfuzz cpdist call. Only each row's top `_TOP_K`
+    pairs by WRatio (ties by candidate order, as process.extract ranks them)
+    get the three extra scorers; the best is the first of those, in WRatio
+    order, with the highest combined score. Rows whose WRatio top is already
+    100 skip the extra scorers. Candidate names are gathered from `clean_arr`
+    (cleaned compared names by row position) through the `id_to_idx` lookup;
+    ids missing from it map to the last `clean_arr` entry (the "" sentinel).
+    Pairs where either name is empty score 0. Every row must have at least
+    one candidate.
+
+    Returns
+    -------
+    (best_pos, best_score, best_idx) arrays, one entry per row; best_idx is
+    the row position of the best candidate in the compared data.
+    """
+    counts = np.fromiter((len(c) for c in cand_rows), dtype=np.int64, count=len(cand_rows))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    flat_idx = np.fromiter(
+        (id_to_idx.get(cid, -1) for cids in cand_rows for cid in cids), dtype=np.int64, count=int(counts.sum())
+    )
+    flat_q = np.repeat(np.asarray(queries, dtype=object), counts).tolist()
+    flat_c = clean_arr[flat_idx].tolist()
+
+    wr = process.cpdist(flat_q, flat_c, scorer=fuzz.WRatio, dtype=np.float64, workers=workers)
+
+    # per row: WRatio desc, ties by candidate position (stable sort)
+    row_of = np.repeat(np.arange(len(cand_rows)), counts)
+    order = np.lexsort((-wr, row_of))
+    rank = np.arange(len(order)) - np.repeat(starts, counts)
+    top = order[rank < _TOP_K]
+    top_row = row_of[top]
+
+    # extra scorers only on the top pairs of rows whose WRatio best is below 100
+    # (a 100 already wins: later pairs need a strictly higher combined score)
+    combined = wr[top]
+    extra = wr[order[starts]][top_row] < 100
+    # empty query / candidate name -> stays 0 (WRatio's value); partial_ratio and
+    # token_sort_ratio would give ("", "") 100
+    extra &= np.fromiter((bool(flat_q[j]) and bool(flat_c[j]) for j in top), dtype=bool, count=len(top))
+    if extra.any():
+        sel = top[extra]
+        q_sel = [flat_q[j] for j in sel]
+        c_sel = [flat_c[j] for j in sel]
+        combined[extra] = np.maximum.reduce([combined[extra]] + [
+            process.cpdist(q_sel, c_sel, scorer=scorer, dtype=np.float64, workers=workers)
+            for scorer in _EXTRA_SCORERS
+        ])
+
+    # first max per row in WRatio order (stable sort on the already row-grouped top pairs)
+    top_starts = np.concatenate([[0], np.cumsum(np.minimum(counts, _TOP_K))[:-1]])
+    best_flat = top[np.lexsort((-combined, top_row))[top_starts]]
+    best_score = np.maximum.reduceat(combined, top_starts)
+
+    return best_flat - starts, best_score, flat_idx[best_flat]
+
 def match_by_name(
     reference_gdf: gpd.GeoDataFrame,
     compared_gdf: gpd.GeoDataFrame,
@@ -38,9 +134,17 @@ def match_by_name(
     comp_id: str = "id",
     comp_id_col: str="cat_main",
     threshold: int = 80,
+    n_jobs: int = -1,
 ):
     """
-    Perform WRatio name matching within spatial candidates.
+    Perform fuzzy name matching within spatial candidates.
+
+    The name score is max(WRatio, partial_ratio, token_sort_ratio,
+    token_set_ratio) over the top 5 candidates by WRatio. Reference rows are
+    split into blocks scored on `n_jobs` threads (-1 = all cores); rapidfuzz
+    releases the GIL while scoring, so threads overlap. name_score holds the
+    best candidate's score even when it is below `threshold` (no match).
+    Empty cleaned names score 0 and never match.
 
     Returns
     -------
@@ -49,69 +153,65 @@ def match_by_name(
     - name_score
     """
 
-    # clean names for matching
-    id_to_name_clean = compared_gdf.set_index(comp_id)[comp_name_col].apply(clean_name).apply(extract_prinmary_str).to_dict()
-    # raw names for storage
-    id_to_name_raw = compared_gdf.set_index(comp_id)[comp_name_col].to_dict()
+    # compared side by row position: id -> position LUT + cleaned / raw names / category arrays
+    cmp_names = compared_gdf[comp_name_col].to_numpy(object)
+    id_to_idx = {cid: i for i, cid in enumerate(compared_gdf[comp_id].to_numpy())}
+    # clean names for matching (normalize each unique name once; NaN -> "")
+    cmp_proc = {n: extract_prinmary_str(clean_name(n)) for n in compared_gdf[comp_name_col].dropna().unique()}
+    clean_arr = np.fromiter((cmp_proc.get(name, "") for name in cmp_names), dtype=object, count=len(cmp_names))
+    ref_proc = {n: extract_prinmary_str(clean_name(n)) for n in reference_gdf[re_name_col].dropna().unique()}
     # raw compared df category
-    id_to_cat = compared_gdf.set_index(comp_id)[comp_id_col].to_dict()
-
-    matched_ids = []
-    scores = []
-    loc_dists = []
-    matched_names = []
-    matched_cats = []
-
-    for _, row in reference_gdf.iterrows():
-        query = extract_prinmary_str(clean_name(row.get(re_name_col)))
-
-        if not isinstance(query, str) or not row["cand_ids"]:
-            matched_ids.append(pd.NA)
-            scores.append(pd.NA)
-            loc_dists.append(pd.NA)
-            matched_names.append(pd.NA)
-            matched_cats.append(pd.NA)
-            continue
-
-        cand_names = [id_to_name_clean.get(cid, "") for cid in row["cand_ids"]]
-
-        top_matches = process.extract(
-            query,
-            cand_names,
-            scorer=fuzz.WRatio,
-            limit=5
+    cmp_cats = compared_gdf[comp_id_col].to_numpy(object)
+    # trailing sentinel row for candidate ids missing from compared_gdf (e.g. filtered
+    # after search_spatial_candidates): empty clean name, NA raw name / category
+    cmp_names = np.append(cmp_names, pd.NA)
+    clean_arr = np.append(clean_arr, "")
+    cmp_cats = np.append(cmp_cats, pd.NA)
+
+    # plain object arrays instead of iterrows() -> no per-row Series
+    names = reference_gdf[re_name_col].to_numpy(object)
+    cand_ids_arr = reference_gdf["cand_ids"].to_numpy(object)
+    cand_dists_arr = reference_gdf["cand_dist_m"].to_numpy(object)
+    queries = [ref_proc.get(name, "") for name in names]
+    n = len(names)
+
+    matched_ids = np.full(n, pd.NA, dtype=object)
+    scores = np.full(n, pd.NA, dtype=object)
+    loc_dists = np.full(n, pd.NA, dtype=object)
+    matched_names = np.full(n, pd.NA, dtype=object)
+    matched_cats = np.full(n, pd.NA, dtype=object)
+
+    # rows with something to score
+    todo = np.array(
+        [i for i in range(n) if isinstance(queries[i], str) and len(cand_ids_arr[i])],
+        dtype=np.int64,
+    )
+    best_pos = np.empty(len(todo), dtype=np.int64)
+    best_score = np.empty(len(todo), dtype=np.float64)
+    best_idx = np.empty(len(todo), dtype=np.int64)
+
+    if len(todo):
+        # at least one block per thread; each block's cpdist stays single-threaded
+        n_blocks = max(effective_n_jobs(n_jobs), -(-len(todo) // _BLOCK_ROWS))
+        blocks = [rows for rows in np.array_split(todo, n_blocks) if len(rows)]
+        results = Parallel(n_jobs=n_jobs, backend="threading")(
+            delayed(_score_block)([queries[i] for i in rows], cand_ids_arr[rows], id_to_idx, clean_arr, 1)
+            for rows in blocks
         )
-
-        best_score = -1
-        best_pos = None
-
-        for name, wr, pos in top_matches:
-
-            pr = fuzz.partial_ratio(query, name)
-            ts = fuzz.token_sort_ratio(query, name)
-            tset = fuzz.token_set_ratio(query, name)
-
-            combined = max(wr, pr, ts, tset)
-
-            if combined > best_score:
-                best_score = combined
-                best_pos = pos
-
-        score = best_score
-
-        if score >= threshold:
-            matched_ids.append(row["cand_ids"][best_pos])
-            scores.append(score)
-            loc_dists.append(row["cand_dist_m"][best_pos])
-            matched_names.append(id_to_name_raw.get(row["cand_ids"][best_pos]))
-            matched_cats.append(id_to_cat.get(row["cand_ids"][best_pos]))
-        else:
-            matched_ids.append(pd.NA)
-            scores.append(score)
-            loc_dists.append(pd.NA)
-            matched_names.append(pd.NA)
-            matched_cats.append(pd.NA)
-
+        best_pos = np.concatenate([r[0] for r in results])
+        best_score = np.concatenate([r[1] for r in results])
+        best_idx = np.concatenate([r[2] for r in results])
+
+    scores[todo] = best_score.tolist()
+
+    # an empty cleaned query (None, "(closed)", non-Latin names, ...) never matches
+    has_query = np.fromiter((bool(queries[i]) for i in todo), dtype=bool, count=len(todo))
+    hit = (best_score >= threshold) & has_query
+    hit_rows = todo[hit]
+    matched_ids[hit_rows] = [cand_ids_arr[i][p] for i, p in zip(hit_rows, best_pos[hit])]
+    loc_dists[hit_rows] = [cand_dists_arr[i][p] for i, p in zip(hit_rows, best_pos[hit])]
+    matched_names[hit_rows] = cmp_names[best_idx[hit]]
+    matched_cats[hit_rows] = cmp_cats[best_idx[hit]]
 
     result = reference_gdf.copy()
     result["matched_id"] = matched_ids
@@ -16,20 +16,29 @@ def search_spatial_candidates(
     Returns
     -------
     GeoDataFrame with two new columns:
-    - cand_ids   : list of compared ids
-    - cand_dist_m: list of distances (meters)
+    - cand_ids   : 1-D array of compared ids
+    - cand_dist_m: 1-D float32 array of distances (meters)
     """
 
-    ref_proj = reference_gdf.to_crs(crs_for_distance)
-    cmp_proj = compared_gdf.to_crs(crs_for_distance)
+    # skip the reprojection when inputs are already in the distance CRS
+    ref_proj = reference_gdf if reference_gdf.crs == crs_for_distance else reference_gdf.to_crs(crs_for_distance)
+    cmp_proj = compared_gdf if compared_gdf.crs == crs_for_distance else compared_gdf.to_crs(crs_for_distance)
 
     ref_xy = np.column_stack([ref_proj.geometry.x, ref_proj.geometry.y])
     cmp_xy = np.column_stack([cmp_proj.geometry.x, cmp_proj.geometry.y])
 
-    tree = cKDTree(cmp_xy)
+    # float64 kept on purpose: float32 is only ~1 m precise at 3857 continental coordinates
+    tree = cKDTree(cmp_xy, balanced_tree=True, compact_nodes=True)
     k_eff = min(k, len(compared_gdf))
 
-    dist, idx = tree.query(ref_xy, k=k_eff)
+    # prune beyond max_dist inside the tree traversal; misses come back as dist=inf, idx=len(cmp_xy)
+    # (nextafter keeps points at exactly max_dist, the bound is exclusive)
+    dist, idx = tree.query(
+        ref_xy,
+        k=k_eff,
+        distance_upper_bound=np.nextafter(max_dist, np.inf),
+        workers=-1,
+    )
 
     if k_eff == 1:
         dist = dist.reshape(-1, 1)
@@ -37,20 +46,18 @@ def search_spatial_candidates(
 
     cmp_ids = compared_gdf[id_col].to_numpy()
 
-    cand_ids = []
-    cand_dists = []
+    # keep only neighbours within max_dist, one boolean mask over the N x k array
+    # (also drops the inf / out-of-range sentinel slots)
+    mask = dist <= max_dist
 
-    for row_idx, row_dist in zip(idx, dist):
-        ids = []
-        dists = []
-
-        for j, d in zip(row_idx, row_dist):
-            if d <= max_dist:
-                ids.append(cmp_ids[j])
-                dists.append(d)
-
-        cand_ids.append(ids)
-        cand_dists.append(dists)
+    # CSR layout: flat kept neighbours (row-major) + row offsets, split into per-row lists at the end
+    offsets = np.cumsum(mask.sum(axis=1))[:-1]
+    flat_ids = cmp_ids[idx[mask]]
+    flat_dists = dist[mask]
+    # per-row 1-D array views into the flat arrays (no per-element Python objects)
+    n_rows = len(mask)
+    cand_ids = np.split(flat_ids, offsets)[:n_rows]
+    cand_dists = np.split(flat_dists.astype(np.float32), offsets)[:n_rows]
 
     result = reference_gdf.copy()
     result["cand_ids"] = cand_ids
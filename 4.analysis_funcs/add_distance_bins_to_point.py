@@ -14,17 +14,20 @@ def add_distance_bins_to_point(
     pt = ref
     pt_gdf = gpd.GeoDataFrame(geometry=[pt], crs=src_crs)
 
-    # project
-    gdf_proj = gdf.to_crs(proj_crs)
-    pt_proj = pt_gdf.to_crs(proj_crs)
+    # project (skip when already in proj_crs)
+    gdf_proj = gdf if gdf.crs == proj_crs else gdf.to_crs(proj_crs)
+    pt_proj = pt_gdf if pt_gdf.crs == proj_crs else pt_gdf.to_crs(proj_crs)
 
-    # distance (meters)
-    gdf[dist_col] = gdf_proj.geometry.distance(pt_proj.geometry.iloc[0]) 
+    # distance (meters), plain euclidean on projected x/y instead of per-point GEOS calls
+    p0 = pt_proj.geometry.iloc[0]
+    dist = np.hypot(gdf_proj.geometry.x.to_numpy() - p0.x, gdf_proj.geometry.y.to_numpy() - p0.y)
+    gdf[dist_col] = dist
 
     # bins
-    dmin, dmax = gdf[dist_col].min(), gdf[dist_col].max()
+    # nan-aware: missing / empty geometries give NaN distances (left unbinned)
+    dmin, dmax = np.nanmin(dist), np.nanmax(dist)
     bins = np.linspace(dmin, dmax, n_bins + 1)
 
-    gdf[bin_col] = pd.cut(gdf[dist_col],bins=bins,include_lowest=True)
+    gdf[bin_col] = pd.cut(dist, bins=bins, include_lowest=True)
 
     return gdf
\ No newline at end of file
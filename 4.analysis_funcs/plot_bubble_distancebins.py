@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
 import matplotlib.colors as mcolors
+from matplotlib.collections import LineCollection
 
 def plot_bubble_distancebins(
     df,
@@ -19,6 +20,10 @@ def plot_bubble_distancebins(
 
     cmap = cm.get_cmap('RdYlGn') 
     
+    # 先收集所有 (cat, src) 的点和横线，最后一次性绘制 (一个 PathCollection + 一个 LineCollection)
+    xs, ys, sizes, c_vals = [], [], [], []
+    segments = []
+
     for i, cat in enumerate(cats):
         base_y = i * 4  
         df_cat = df[df[primary_cat_col] == cat].sort_values(bin_col)
@@ -27,26 +32,31 @@ def plot_bubble_distancebins(
 
         for j, src in enumerate(sources):
             line_y = base_y - (j * 0.8) 
-            x = df_cat[bin_col]
-            den_val = df_cat[f"match_den_{src}"]
-            c_val = df_cat[f"match_c_{src}"]
+            x = df_cat[bin_col].to_numpy()
+            den_val = df_cat[f"match_den_{src}"].to_numpy()
+            c_val = df_cat[f"match_c_{src}"].to_numpy()
             
-            ax.hlines(line_y, x.min(), x.max(), colors='gray', alpha=0.15, linewidth=1, zorder=1)
+            segments.append([(x.min(), line_y), (x.max(), line_y)])
             ax.text(x.min() - 0.3, line_y, src.upper(), ha='right', va='center', fontsize=9, alpha=0.7)
 
-            bubble_sizes = np.sqrt(den_val) * 3000 + 100 
-            
-            scatter = ax.scatter(
-                x, [line_y] * len(x),
-                s=bubble_sizes,
-                c=c_val,
-                cmap=cmap,
-                vmin=0, vmax=1,
-                edgecolors='black',
-                linewidths=0.5,
-                alpha=0.85,
-                zorder=2
-            )
+            xs.append(x)
+            ys.append(np.full(len(x), line_y))
+            sizes.append(np.sqrt(den_val) * 3000 + 100)
+            c_vals.append(c_val)
+
+    ax.add_collection(LineCollection(segments, colors='gray', alpha=0.15, linewidth=1, zorder=1))
+
+    scatter = ax.scatter(
+        np.concatenate(xs), np.concatenate(ys),
+        s=np.concatenate(sizes),
+        c=np.concatenate(c_vals),
+        cmap=cmap,
+        vmin=0, vmax=1,
+        edgecolors='black',
+        linewidths=0.5,
+        alpha=0.85,
+        zorder=2
+    )
 
     # 【优化】X 轴移到上方
     ax.xaxis.set_ticks_position('top')
@@ -46,10 +46,10 @@ def plot_variable_width_missmate(
             # --- 多项式回归平滑 ---
             x_smooth = np.linspace(x_v.min(), x_v.max(), 300)
             deg = 2
-            coef_y = np.polyfit(x_v, y_v, deg)
-            coef_d = np.polyfit(x_v, d_v, deg)
-            spl_y = np.polyval(coef_y, x_smooth)
-            spl_d = np.clip(np.polyval(coef_d, x_smooth), 0, None)
+            # y 和 dens 共用 x_v -> 一次 polyfit (2D y) 同时拟合两条曲线
+            coef = np.polyfit(x_v, np.column_stack([y_v, d_v]), deg)
+            spl_y = np.polyval(coef[:, 0], x_smooth)
+            spl_d = np.clip(np.polyval(coef[:, 1], x_smooth), 0, None)
 
             # --- per-line 归一化 + 幂次拉大对比 ---
             den_norm = (spl_d - spl_d.min()) / (spl_d.max() - spl_d.min() + 1e-9)
@@ -22,17 +22,23 @@ def summarize_match_miss_by_dist_bin(
 
     df = gdf.copy()
 
+    # flags as boolean columns -> plain C-level sums per group (no per-group lambda)
+    df["_match"] = df[true_col].eq(match_value)
+    df["_nonmatch"] = ~df["_match"]  # NaN -> miss
+    df["_mistake"] = df[true_col].eq("0")  # n_mistake_match: true_col == "0"
+    df["_miss"] = df[true_col].isna()  # n_first_miss: true_col 是 NaN
+
     # group stats
     df_out = (
         df.groupby([cat_col, dist_bin_col], observed=True)
-          .apply(lambda x: pd.Series({
-              "n_total": len(x),
-              n_match_col: x[true_col].eq(match_value).sum(),
-              n_nonmatch_col:  (~x[true_col].eq(match_value)).sum(),  # NaN -> miss
-              n_mistake_col: x[true_col].eq("0").sum(), # n_mistake_match: true_col == "0"
-              n_miss_col: x[true_col].isna().sum(), # n_first_miss: true_col 是 NaN
-              median_name_score_col: x[name_score_col].median(),
-          }))
+          .agg(**{
+              "n_total": (true_col, "size"),
+              n_match_col: ("_match", "sum"),
+              n_nonmatch_col: ("_nonmatch", "sum"),
+              n_mistake_col: ("_mistake", "sum"),
+              n_miss_col: ("_miss", "sum"),
+              median_name_score_col: (name_score_col, "median"),
+          })
           .reset_index()
     )
 
@@ -44,7 +50,8 @@ def summarize_match_miss_by_dist_bin(
     df_out[bin_id_col] = df_out.groupby(cat_col, observed=True).cumcount() + 1
 
     # ring area
-    area = df_out[dist_bin_col].apply(lambda x: np.pi * (x.right**2 - x.left**2)).astype(float)
+    bins = pd.IntervalIndex(df_out[dist_bin_col].astype(object))
+    area = pd.Series(np.pi * (bins.right ** 2 - bins.left ** 2), index=df_out.index, dtype=float)
     if area_unit == "km2":
         area = area / 1e6
     df_out[ring_area_col] = area